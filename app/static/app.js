@@ -198,12 +198,16 @@ async function fetchState() {
     return;
   }
   try {
-    const url = `/api/state?room=${encodeURIComponent(session.roomCode)}&player_id=${encodeURIComponent(
+    let url = `/api/state?room=${encodeURIComponent(session.roomCode)}&player_id=${encodeURIComponent(
       session.playerId,
     )}`;
+    // With the last seen version the server answers {"unchanged": true} until the room moves on.
+    if (latestState && latestState.version && latestState.room.code === session.roomCode) {
+      url += `&since=${encodeURIComponent(latestState.version)}`;
+    }
     const response = await fetch(url, {
       method: "GET",
-      headers: { "Cache-Control": "no-store" },
+      cache: "no-store",
     });
     const data = await response.json().catch(() => null);
     if (!response.ok) {
@@ -211,6 +215,7 @@ async function fetchState() {
       handleStateError(message);
       return;
     }
+    if (data.unchanged) return;
     latestState = data;
     updateUI(data);
   } catch (error) {
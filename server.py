@@ -1,22 +1,45 @@
+import gzip
+import hashlib
 import json
 import logging
+import mimetypes
 import os
 import random
+import secrets
+import shutil
 import string
+import struct
 import threading
-from dataclasses import dataclass, field
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
+from email.utils import formatdate
 from http import HTTPStatus
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import parse_qs, urlparse
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote_plus
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; the standard library encoder is used otherwise.
+    orjson = None
 
 
 BASE_DIR = Path(__file__).parent
 STATIC_DIR = BASE_DIR / "app" / "static"
 DATA_DIR = BASE_DIR / "data"
-SCOREBOARD_FILE = DATA_DIR / "scoreboard.json"
+SCOREBOARD_FILE = DATA_DIR / "scoreboard.jsonl"
+SCOREBOARD_ROTATE_BYTES = 1 << 20
+HANDLER_THREAD_STACK_SIZE = 512 * 1024
+DEFAULT_HTTP_THREADS = min(32, (os.cpu_count() or 1) * 4)
+SINGLE_WRITE_LIMIT = 64 * 1024
+MAX_REQUEST_BODY = 1 << 20
+RESPONSE_PROTOCOL = "HTTP/1.1"
+KEEP_ALIVE_TIMEOUT = 5
+GZIP_MIN_BYTES = 512
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,35 +51,235 @@ SUIT_SEQUENCE = ["S", "D", "C", "H"]
 SUIT_SYMBOLS = {"S": "♠", "D": "♦", "C": "♣", "H": "♥"}
 SUIT_NAMES = {"S": "Spades", "D": "Diamonds", "C": "Clubs", "H": "Hearts"}
 RANKS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
-RANK_ORDER = {rank: index for index, rank in enumerate(RANKS)}
 DEFAULT_BASE_HAND = 8
 BASE_HAND_OPTIONS = {4: 12, 8: 6, 16: 3}
+ROUND_SEQUENCES = {
+    base: tuple(range(base, 0, -1)) + tuple(range(2, base + 1)) for base in BASE_HAND_OPTIONS
+}
+
+
+# Cards are ints: suit_index * 13 + rank_index.
+CARD_CODES = tuple(range(len(SUIT_SEQUENCE) * len(RANKS)))
+SUIT_OF = tuple(code // len(RANKS) for code in CARD_CODES)
+RANK_OF = tuple(code % len(RANKS) for code in CARD_CODES)
+WIRE_STR = tuple(f"{RANKS[RANK_OF[code]]}{SUIT_SEQUENCE[SUIT_OF[code]]}" for code in CARD_CODES)
+DISPLAY_STR = tuple(
+    f"{RANKS[RANK_OF[code]]}{SUIT_SYMBOLS[SUIT_SEQUENCE[SUIT_OF[code]]]}" for code in CARD_CODES
+)
+CARD_BY_WIRE = {wire: code for code, wire in enumerate(WIRE_STR)}
+CARD_INFO = tuple({"card": WIRE_STR[code], "display": DISPLAY_STR[code]} for code in CARD_CODES)
+TRUMP_INFO = tuple(
+    {"code": suit, "name": SUIT_NAMES[suit], "symbol": SUIT_SYMBOLS[suit]} for suit in SUIT_SEQUENCE
+)
+
+
+STATIC_CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class StaticAsset:
+    content: bytes
+    etag: str
+    headers: bytes
+    gzipped: Optional[bytes] = None
+    gzip_etag: str = ""
+    gzip_headers: bytes = b""
+
+
+@dataclass(slots=True)
+class EncodedBody:
+    data: bytes
+    etag: str
+    gzipped: Optional[bytes] = None
+
+    def compressed(self) -> bytes:
+        if self.gzipped is None:
+            self.gzipped = gzip.compress(self.data, 1, mtime=0)
+        return self.gzipped
+
+
+@dataclass(slots=True)
+class DeflatePiece:
+    """Body fragment deflated on its own, so fragments can be joined into one gzip member."""
+
+    data: bytes
+    final: bool
+    crc: int = 0
+    deflated: Optional[bytes] = None
+
+    def deflate(self) -> bytes:
+        if self.deflated is None:
+            compressor = zlib.compressobj(1, zlib.DEFLATED, -zlib.MAX_WBITS)
+            flush = zlib.Z_FINISH if self.final else zlib.Z_SYNC_FLUSH
+            self.deflated = compressor.compress(self.data) + compressor.flush(flush)
+        return self.deflated
+
+
+@dataclass(slots=True)
+class StateBody:
+    head: DeflatePiece
+    tail: DeflatePiece
+    etag: str
+
+    @property
+    def data(self) -> bytes:
+        return self.head.data + self.tail.data
+
+    def compressed(self) -> bytes:
+        size = len(self.head.data) + len(self.tail.data)
+        trailer = struct.pack("<II", zlib.crc32(self.tail.data, self.head.crc), size & 0xFFFFFFFF)
+        return GZIP_MEMBER_HEADER + self.head.deflate() + self.tail.deflate() + trailer
+
+
+STATUS_LINES = {
+    status: f"{RESPONSE_PROTOCOL} {status.value} {status.phrase}\r\n".encode("latin-1")
+    for status in HTTPStatus
+}
+NO_STORE_HEADERS = b"Access-Control-Allow-Origin: *\r\nCache-Control: no-store\r\n"
+JSON_CONTENT_TYPE = b"Content-Type: application/json; charset=utf-8\r\n"
+VARY_HEADER = b"Vary: Accept-Encoding\r\n"
+GZIP_HEADER = b"Content-Encoding: gzip\r\n"
+KEEP_ALIVE_HEADER = b"Connection: keep-alive\r\n"
+CLOSE_HEADER = b"Connection: close\r\n"
+GZIP_MEMBER_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+OPTIONS_HEADERS = (
+    b"Access-Control-Allow-Origin: *\r\n"
+    b"Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n"
+    b"Access-Control-Allow-Headers: Content-Type\r\n"
+)
+_date_header: Tuple[int, bytes] = (0, b"")
+
+
+def http_date_header() -> bytes:
+    global _date_header
+    now = int(time.time())
+    if _date_header[0] != now:
+        _date_header = (now, f"Date: {formatdate(now, usegmt=True)}\r\n".encode("ascii"))
+    return _date_header[1]
+
 
+def gzip_etag(etag: str) -> str:
+    return etag[:-1] + '-gzip"'
 
-def build_deck() -> List[str]:
-    """Return a fresh 52-card deck represented as strings like 'AS'."""
-    return [f"{rank}{suit}" for suit in SUIT_SEQUENCE for rank in RANKS]
+
+def accepts_gzip(header: str) -> bool:
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() != "gzip":
+            continue
+        weight = params.strip().lower()
+        if not weight:
+            return True
+        try:
+            return float(weight.removeprefix("q=")) > 0
+        except ValueError:
+            return False
+    return False
 
 
-def card_sort_key(card: str) -> Tuple[int, int]:
-    rank, suit = card[:-1], card[-1]
-    return (suit_index(suit), RANK_ORDER[rank])
+def revalidate_headers(etag: str) -> bytes:
+    return (
+        b"Access-Control-Allow-Origin: *\r\nCache-Control: no-cache\r\nETag: %s\r\n"
+        % etag.encode("ascii")
+    )
 
 
-def suit_index(suit: str) -> int:
-    return SUIT_SEQUENCE.index(suit)
+def load_static_files(root: Path) -> Dict[str, StaticAsset]:
+    cache: Dict[str, StaticAsset] = {}
+    for path in root.rglob("*"):
+        if not path.is_file():
+            continue
+        content = path.read_bytes()
+        content_type = (
+            STATIC_CONTENT_TYPES.get(path.suffix)
+            or mimetypes.guess_type(path.name)[0]
+            or "application/octet-stream"
+        )
+        etag = f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+        type_header = b"Content-Type: %s\r\n" % content_type.encode()
+        asset = StaticAsset(
+            content=content,
+            etag=etag,
+            headers=revalidate_headers(etag) + type_header,
+        )
+        if len(content) > GZIP_MIN_BYTES and content_type.startswith(COMPRESSIBLE_TYPES):
+            asset = replace(
+                asset,
+                headers=asset.headers + VARY_HEADER,
+                gzipped=gzip.compress(content, mtime=0),
+                gzip_etag=gzip_etag(etag),
+                gzip_headers=(
+                    revalidate_headers(gzip_etag(etag)) + type_header + VARY_HEADER + GZIP_HEADER
+                ),
+            )
+        cache[path.relative_to(root).as_posix()] = asset
+    return cache
+
 
+STATIC_CACHE = load_static_files(STATIC_DIR)
 
-def card_to_display(card: str) -> str:
-    rank, suit = card[:-1], card[-1]
-    return f"{rank}{SUIT_SYMBOLS[suit]}"
+
+def encode_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def decode_json(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+ERROR_BODIES = {
+    message: encode_json({"error": message})
+    for message in (
+        "Invalid JSON",
+        "Invalid Content-Length",
+        "Request body too large",
+        "Request body must be a JSON object",
+        "Endpoint not found",
+        "room parameter required",
+        "Room not found",
+        "It is not your turn",
+    )
+}
+UNCHANGED_BODY = encode_json({"unchanged": True})
+
+
+def parse_query(query: str) -> Dict[str, str]:
+    params: Dict[str, str] = {}
+    for pair in query.split("&"):
+        key, _, value = pair.partition("=")
+        if "%" in pair or "+" in pair:
+            key, value = unquote_plus(key), unquote_plus(value)
+        if value:
+            params.setdefault(key, value)
+    return params
+
+
+def text_fields(payload: dict, *keys: str) -> List[str]:
+    values = []
+    for key in keys:
+        value = payload.get(key)
+        if value is None:
+            value = ""
+        elif not isinstance(value, str):
+            raise ValueError(f"{key} must be a string")
+        values.append(value)
+    return values
 
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerState:
     player_id: str
     name: str
@@ -64,7 +287,7 @@ class PlayerState:
     correct_bids: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class RoundState:
     cards_per_player: int
     dealer_index: int
@@ -72,20 +295,25 @@ class RoundState:
     trump_index: int
     bids: Dict[str, Optional[int]] = field(default_factory=dict)
     tricks_won: Dict[str, int] = field(default_factory=dict)
-    hands: Dict[str, List[str]] = field(default_factory=dict)
-    current_trick: List[Tuple[str, str]] = field(default_factory=list)
+    hands: Dict[str, List[int]] = field(default_factory=dict)
+    current_trick: List[Tuple[str, int]] = field(default_factory=list)
+    current_trick_payload: List[Dict[str, str]] = field(default_factory=list)
     trick_history: List[Dict[str, str]] = field(default_factory=list)
     status: str = "bidding"
     blind_bidding: bool = False
     current_turn_index: int = 0
+    bid_total: int = 0
+    bid_count: int = 0
+    suit_counts: Dict[str, List[int]] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
     players_order: List[str]
     dealer_index: int
     trump_index: int
-    round_sequence: List[int]
+    round_sequence: Tuple[int, ...]
+    seat_of: Dict[str, int] = field(default_factory=dict)
     current_round: int = 0
     round_state: Optional[RoundState] = None
     started_at: datetime = field(default_factory=utc_now)
@@ -93,41 +321,180 @@ class GameState:
     round_log: List[dict] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     code: str
     created_at: datetime
     host_id: str
     players: List[PlayerState] = field(default_factory=list)
+    players_by_id: Dict[str, PlayerState] = field(default_factory=dict)
     status: str = "waiting"
     game: Optional[GameState] = None
     last_result: Optional[dict] = None
     base_cards: int = DEFAULT_BASE_HAND
+    # Guards players, status, game and everything reachable from it.
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    version: int = 0
+    state_cache: Dict[Optional[str], DeflatePiece] = field(default_factory=dict, repr=False)
+    state_cache_key: Tuple[int, int] = (-1, -1)
+    rounds_summary: List[dict] = field(default_factory=list, repr=False)
+    rounds_summary_version: int = -1
+    rounds_summary_json: Tuple[int, bytes] = (-1, b"")
+
+
+@dataclass(slots=True)
+class StateSnapshot:
+    code: str
+    status: str
+    host_id: str
+    created_at: datetime
+    base_cards: int
+    last_result: Optional[dict]
+    players: List[Tuple[str, str, int, int]]
+    game_started: bool = False
+    game_finished: bool = False
+    current_round: int = 0
+    trump_index: int = 0
+    players_order: List[str] = field(default_factory=list)
+    round_sequence: Tuple[int, ...] = ()
+    rounds_summary: List[dict] = field(default_factory=list)
+    round_state: Optional[RoundState] = None
+    hand: Optional[List[int]] = None
+    allowed_bids: Optional[List[int]] = None
+    allowed_cards: Optional[List[int]] = None
 
 
 class ScoreboardStorage:
+    """Append-only JSON Lines log of completed games, one entry per line."""
+
     def __init__(self, path: Path) -> None:
         self.path = path
+        self.archive_path = path.with_name(path.name + ".gz")
         self.lock = threading.Lock()
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        if not self.path.exists():
-            self.path.write_text("[]", encoding="utf-8")
+        self._migrate_legacy_file()
+        self._entries = self._read_entries()
+        self._encoded: Tuple[int, EncodedBody, DeflatePiece] = (
+            -1,
+            EncodedBody(b"", '""'),
+            DeflatePiece(b"", final=False),
+        )
+        self._handle = self.path.open("ab", buffering=64 * 1024)
 
-    def append_entry(self, entry: dict) -> None:
-        with self.lock:
-            data = json.loads(self.path.read_text(encoding="utf-8"))
-            data.append(entry)
-            self.path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    def _migrate_legacy_file(self) -> None:
+        legacy = self.path.with_suffix(".json")
+        if self.path.exists() or not legacy.exists():
+            return
+        entries = decode_json(legacy.read_bytes())
+        with self.path.open("wb") as fh:
+            for entry in entries:
+                fh.write(encode_json(entry) + b"\n")
+        logger.info("Migrated %d scoreboard entries from %s", len(entries), legacy.name)
 
-    def load_entries(self) -> List[dict]:
+    def append_entry(self, entry: dict) -> None:
+        line = encode_json(entry) + b"\n"
         with self.lock:
-            return json.loads(self.path.read_text(encoding="utf-8"))
+            self._handle.write(line)
+            self._handle.flush()
+            self._entries.append(entry)
+            if self._handle.tell() > SCOREBOARD_ROTATE_BYTES:
+                self._rotate()
+
+    def entries_response(self) -> EncodedBody:
+        return self._encode()[1]
+
+    def state_head(self) -> Tuple[int, DeflatePiece]:
+        """Return the log's version and the opening of a state body that embeds it."""
+        version, _, head = self._encode()
+        return version, head
+
+    def _encode(self) -> Tuple[int, EncodedBody, DeflatePiece]:
+        cached = self._encoded
+        if cached[0] != len(self._entries):
+            entries = list(self._entries)
+            entries_json = encode_json(entries)
+            response = EncodedBody(b'{"entries":' + entries_json + b"}", f'"{len(entries)}"')
+            head_data = b'{"scoreboard":' + entries_json + b","
+            head = DeflatePiece(head_data, final=False, crc=zlib.crc32(head_data))
+            cached = (len(entries), response, head)
+            self._encoded = cached
+        return cached
+
+    @property
+    def version(self) -> int:
+        return len(self._entries)
+
+    def _rotate(self) -> None:
+        self._handle.close()
+        pending = self.archive_path.with_name(self.archive_path.name + ".tmp")
+        with pending.open("wb") as fh:
+            if self.archive_path.exists():
+                with self.archive_path.open("rb") as archive:
+                    shutil.copyfileobj(archive, fh)
+            with gzip.GzipFile(fileobj=fh, mode="wb", mtime=0) as member:
+                member.write(self.path.read_bytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(pending, self.archive_path)
+        self._handle = self.path.open("wb", buffering=64 * 1024)
+        logger.info("Rotated scoreboard log into %s", self.archive_path.name)
+
+    def _read_archive(self) -> bytes:
+        if not self.archive_path.exists():
+            return b""
+        data = self.archive_path.read_bytes()
+        members = []
+        offset = 0
+        while offset < len(data):
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            member = decompressor.decompress(data[offset:])
+            if not decompressor.eof:
+                logger.warning("Dropping truncated last member of %s", self.archive_path.name)
+                with self.archive_path.open("r+b") as fh:
+                    fh.truncate(offset)
+                break
+            members.append(member)
+            offset = len(data) - len(decompressor.unused_data)
+        return b"".join(members)
+
+    def _read_entries(self) -> List[dict]:
+        archived = self._read_archive()
+        entries = [decode_json(line) for line in archived.split(b"\n") if line.strip()]
+        if self.path.exists():
+            with self.path.open("rb") as fh:
+                lines = fh.readlines()
+            if lines and archived.endswith(b"".join(lines)):
+                # Archived by a rotation that stopped before emptying the active log.
+                logger.warning(
+                    "Discarding %s, already in %s", self.path.name, self.archive_path.name
+                )
+                self.path.write_bytes(b"")
+                return entries
+            for index, line in enumerate(lines):
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(decode_json(line))
+                except ValueError:
+                    if index != len(lines) - 1:
+                        raise
+                    # Torn by a crash mid-append.
+                    logger.warning("Dropping unreadable last line of %s", self.path.name)
+                    with self.path.open("r+b") as fh:
+                        fh.truncate(sum(len(previous) for previous in lines[:-1]))
+                    break
+            else:
+                if lines and not lines[-1].endswith(b"\n"):
+                    with self.path.open("ab") as fh:
+                        fh.write(b"\n")
+        return entries
 
 
 class GameManager:
     def __init__(self, scoreboard: ScoreboardStorage) -> None:
+        # rooms_lock only guards inserts; per-room state is guarded by Room.lock.
         self.rooms: Dict[str, Room] = {}
-        self.lock = threading.Lock()
+        self.rooms_lock = threading.Lock()
         self.scoreboard = scoreboard
 
     def create_room(self, host_name: str, base_cards: int) -> dict:
@@ -136,7 +503,7 @@ class GameManager:
             raise ValueError("Host name is required")
         base_cards = self._validate_base(base_cards)
 
-        with self.lock:
+        with self.rooms_lock:
             code = self._generate_room_code()
             player_id = self._generate_player_id()
             room = Room(
@@ -147,6 +514,7 @@ class GameManager:
             )
             host = PlayerState(player_id=player_id, name=host_name)
             room.players.append(host)
+            room.players_by_id[player_id] = host
             self.rooms[code] = room
             logger.info(
                 "Room %s created by host %s (%s) with base hand %d",
@@ -168,10 +536,8 @@ class GameManager:
         if not player_name:
             raise ValueError("Player name is required")
 
-        with self.lock:
-            room = self.rooms.get(room_code.upper())
-            if not room:
-                raise ValueError("Room not found")
+        room = self._get_room_or_raise(room_code)
+        with room.lock:
             if room.status != "waiting":
                 raise ValueError("Game already started")
 
@@ -183,7 +549,10 @@ class GameManager:
                     f"Player limit reached for base {room.base_cards}: maximum {max_players} players"
                 )
 
-            room.players.append(PlayerState(player_id=new_player_id, name=player_name))
+            player = PlayerState(player_id=new_player_id, name=player_name)
+            room.players.append(player)
+            room.players_by_id[new_player_id] = player
+            room.version += 1
             logger.info(
                 "Player %s (%s) joined room %s; total players=%d",
                 player_name,
@@ -200,8 +569,8 @@ class GameManager:
             }
 
     def start_game(self, room_code: str, player_id: str) -> dict:
-        with self.lock:
-            room = self._get_room_or_raise(room_code)
+        room = self._get_room_or_raise(room_code)
+        with room.lock:
             if room.host_id != player_id:
                 raise ValueError("Only the host can start the game")
             if len(room.players) < 2:
@@ -217,9 +586,7 @@ class GameManager:
                     f"Too many players for base {base_cards}. Maximum allowed: {max_players}"
                 )
 
-            round_sequence = list(range(base_cards, 0, -1)) + list(
-                range(2, base_cards + 1)
-            )
+            round_sequence = ROUND_SEQUENCES[base_cards]
             order = [p.player_id for p in room.players]
             logger.info(
                 "Starting game in room %s with %d players; starting hand=%d; sequence=%s",
@@ -233,92 +600,109 @@ class GameManager:
                 dealer_index=0,
                 trump_index=0,
                 round_sequence=round_sequence,
+                seat_of={pid: seat for seat, pid in enumerate(order)},
                 round_log=[],
             )
             room.game = game
             room.status = "playing"
             game.round_state = self._create_round_state(room)
+            room.version += 1
             return {"status": "ok"}
 
     def submit_bid(self, room_code: str, player_id: str, bid_value: int) -> dict:
-        with self.lock:
-            room = self._get_room_or_raise(room_code)
+        room = self._get_room_or_raise(room_code)
+        with room.lock:
             game = self._require_game_in_progress(room)
             round_state = self._require_round_state(game)
             if round_state.status != "bidding":
                 raise ValueError("Bidding has finished for this round")
 
-            logger.info(
-                "Room %s round %d: player %s attempting bid %s (current_turn=%s)",
-                room.code,
-                game.current_round + 1,
-                self._player_log(room, player_id),
-                bid_value,
-                self._player_log(
-                    room, game.players_order[round_state.current_turn_index]
-                ),
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Room %s round %d: player %s attempting bid %s (current_turn=%s)",
+                    room.code,
+                    game.current_round + 1,
+                    self._player_log(room, player_id),
+                    bid_value,
+                    self._player_log(
+                        room, game.players_order[round_state.current_turn_index]
+                    ),
+                )
 
             self._ensure_player_turn(game, round_state, player_id)
             if bid_value < 0 or bid_value > round_state.cards_per_player:
                 raise ValueError("Bid outside allowed range")
 
             dealer_id = game.players_order[round_state.dealer_index]
-            projected_total = sum(b for b in round_state.bids.values() if b is not None)
             if player_id == dealer_id:
-                if projected_total + bid_value == round_state.cards_per_player:
+                if round_state.bid_total + bid_value == round_state.cards_per_player:
                     raise ValueError("Dealer bid cannot make totals equal cards dealt")
 
             round_state.bids[player_id] = bid_value
-            if all(b is not None for b in round_state.bids.values()):
+            round_state.bid_total += bid_value
+            round_state.bid_count += 1
+            if round_state.bid_count == len(game.players_order):
                 round_state.status = "playing"
                 round_state.current_turn_index = round_state.starter_index
             else:
                 round_state.current_turn_index = self._next_bidder_index(
                     game, round_state
                 )
-
-            logger.info(
-                "Room %s round %d bids now %s; next turn=%s",
-                room.code,
-                game.current_round + 1,
-                self._bids_debug(room, round_state),
-                self._player_log(
-                    room, game.players_order[round_state.current_turn_index]
-                ),
-            )
+            room.version += 1
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Room %s round %d bids now %s; next turn=%s",
+                    room.code,
+                    game.current_round + 1,
+                    self._bids_debug(room, round_state),
+                    self._player_log(
+                        room, game.players_order[round_state.current_turn_index]
+                    ),
+                )
 
             return {"status": "ok"}
 
     def play_card(self, room_code: str, player_id: str, card: str) -> dict:
         card = card.strip().upper()
-        with self.lock:
-            room = self._get_room_or_raise(room_code)
+        room = self._get_room_or_raise(room_code)
+        with room.lock:
             game = self._require_game_in_progress(room)
             round_state = self._require_round_state(game)
             if round_state.status != "playing":
                 raise ValueError("Cannot play cards during bidding")
 
-            logger.info(
-                "Room %s round %d: player %s playing %s (current_turn=%s)",
-                room.code,
-                game.current_round + 1,
-                self._player_log(room, player_id),
-                card,
-                self._player_log(
-                    room, game.players_order[round_state.current_turn_index]
-                ),
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Room %s round %d: player %s playing %s (current_turn=%s)",
+                    room.code,
+                    game.current_round + 1,
+                    self._player_log(room, player_id),
+                    card,
+                    self._player_log(
+                        room, game.players_order[round_state.current_turn_index]
+                    ),
+                )
             self._ensure_player_turn(game, round_state, player_id)
             hand = round_state.hands[player_id]
-            if card not in hand:
+            code = CARD_BY_WIRE.get(card)
+            if code is None or code not in hand:
                 raise ValueError("Card not in hand")
 
-            if not self._card_play_allowed(round_state, hand, card):
+            if not self._card_play_allowed(round_state, player_id, code):
                 raise ValueError("You must follow suit when possible")
 
-            hand.remove(card)
-            round_state.current_trick.append((player_id, card))
+            hand.remove(code)
+            round_state.suit_counts[player_id][SUIT_OF[code]] -= 1
+            round_state.current_trick.append((player_id, code))
+            round_state.current_trick_payload.append(
+                {
+                    "player_id": player_id,
+                    "player_name": self._player_name(room, player_id),
+                    "card": WIRE_STR[code],
+                    "display": DISPLAY_STR[code],
+                }
+            )
 
             if len(round_state.current_trick) == len(game.players_order):
                 self._close_trick(room, game, round_state)
@@ -326,133 +710,203 @@ class GameManager:
                 round_state.current_turn_index = (
                     round_state.current_turn_index + 1
                 ) % len(game.players_order)
+            room.version += 1
 
             return {"status": "ok"}
 
-    def get_state(self, room_code: str, player_id: Optional[str]) -> dict:
-        with self.lock:
-            room = self.rooms.get(room_code.upper())
-            if not room:
-                raise ValueError("Room not found")
+    def get_state_if_changed(
+        self, room_code: str, player_id: Optional[str], since: Optional[str]
+    ) -> Optional[StateBody]:
+        room = self._get_room_or_raise(room_code)
+        if since is not None and since == self._state_version(room):
+            return None
+        return self.get_state_response(room_code, player_id)
+
+    def get_state_response(self, room_code: str, player_id: Optional[str]) -> StateBody:
+        room = self._get_room_or_raise(room_code)
+        # The scoreboard is shared by every room, so only the rest of the body is cached here.
+        scoreboard_version, head = self.scoreboard.state_head()
+        with room.lock:
+            # Unknown ids are served as spectators.
+            if player_id not in room.players_by_id:
+                player_id = None
+            key = (room.version, scoreboard_version)
+            if room.state_cache_key != key:
+                room.state_cache.clear()
+                room.state_cache_key = key
+            version = f"{key[0]}.{key[1]}"
+            etag = f'"{version}-{player_id or ""}"'
+            cached = room.state_cache.get(player_id)
+            if cached is not None:
+                return StateBody(head, cached, etag)
+            snapshot = self._snapshot_room(room, player_id)
+
+        payload = self._build_state_payload(snapshot, player_id)
+        game = payload.pop("game", None)
+        parts = [encode_json(payload)[1:-1]]
+        if game is not None:
+            del game["rounds"]
+            rounds_json = self._encoded_rounds(room, key[0], snapshot.rounds_summary)
+            parts.append(b',"game":' + encode_json(game)[:-1] + b',"rounds":' + rounds_json + b"}")
+        parts.append(b',"version":"%s"}' % version.encode())
+        tail = DeflatePiece(b"".join(parts), final=True)
+        with room.lock:
+            if room.state_cache_key == key:
+                room.state_cache[player_id] = tail
+        return StateBody(head, tail, etag)
+
+    def _encoded_rounds(self, room: Room, version: int, rounds_summary: List[dict]) -> bytes:
+        cached = room.rounds_summary_json
+        if cached[0] != version:
+            cached = (version, encode_json(rounds_summary))
+            room.rounds_summary_json = cached
+        return cached[1]
+
+    def _state_version(self, room: Room) -> str:
+        return f"{room.version}.{self.scoreboard.version}"
+
+    def _snapshot_room(self, room: Room, player_id: Optional[str]) -> StateSnapshot:
+        snapshot = StateSnapshot(
+            code=room.code,
+            status=room.status,
+            host_id=room.host_id,
+            created_at=room.created_at,
+            base_cards=room.base_cards,
+            last_result=room.last_result,
+            players=[
+                (player.player_id, player.name, player.total_score, player.correct_bids)
+                for player in room.players
+            ],
+        )
+        game = room.game
+        if not game:
+            return snapshot
+
+        snapshot.game_started = True
+        snapshot.game_finished = game.finished
+        snapshot.current_round = game.current_round
+        snapshot.trump_index = game.trump_index
+        snapshot.players_order = list(game.players_order)
+        snapshot.round_sequence = game.round_sequence
+        snapshot.rounds_summary = self._rounds_summary(room)
+
+        round_state = game.round_state
+        if not round_state:
+            return snapshot
+
+        snapshot.round_state = replace(
+            round_state,
+            bids=dict(round_state.bids),
+            tricks_won=dict(round_state.tricks_won),
+            hands={},
+            current_trick=[],
+            current_trick_payload=list(round_state.current_trick_payload),
+            trick_history=[],
+            suit_counts={},
+        )
+        if player_id in round_state.hands:
+            snapshot.hand = list(round_state.hands[player_id])
+
+        turn_player = game.players_order[round_state.current_turn_index]
+        if player_id and player_id == turn_player:
+            if round_state.status == "bidding":
+                snapshot.allowed_bids = self._allowed_bids(game, round_state, player_id)
+            elif round_state.status == "playing":
+                snapshot.allowed_cards = self._allowed_cards(round_state, player_id)
+        return snapshot
+
+    def _build_state_payload(self, snapshot: StateSnapshot, player_id: Optional[str]) -> dict:
+        names = {pid: name for pid, name, _, _ in snapshot.players}
+        players_payload = []
+        for idx, (pid, name, total_score, correct_bids) in enumerate(snapshot.players):
+            players_payload.append(
+                {
+                    "player_id": pid,
+                    "name": name,
+                    "total_score": total_score,
+                    "correct_bids": correct_bids,
+                    "is_host": pid == snapshot.host_id,
+                    "is_you": player_id == pid,
+                    "seat": idx,
+                }
+            )
 
-            players_payload = []
-            for idx, player in enumerate(room.players):
-                players_payload.append(
-                    {
-                        "player_id": player.player_id,
-                        "name": player.name,
-                        "total_score": player.total_score,
-                        "correct_bids": player.correct_bids,
-                        "is_host": player.player_id == room.host_id,
-                        "is_you": player_id == player.player_id,
-                        "seat": idx,
-                    }
-                )
+        max_players = BASE_HAND_OPTIONS.get(snapshot.base_cards)
+
+        response = {
+            "room": {
+                "code": snapshot.code,
+                "status": snapshot.status,
+                "players": players_payload,
+                "host_id": snapshot.host_id,
+                "created_at": snapshot.created_at.replace(microsecond=0)
+                .isoformat()
+                .replace("+00:00", "Z"),
+                "base_cards": snapshot.base_cards,
+                "max_players": max_players,
+            },
+        }
 
-            try:
-                max_players = self._max_players_for_base(room.base_cards)
-            except ValueError:
-                max_players = None
-
-            response = {
-                "room": {
-                    "code": room.code,
-                    "status": room.status,
-                    "players": players_payload,
-                    "host_id": room.host_id,
-                    "created_at": room.created_at.replace(microsecond=0)
-                    .isoformat()
-                    .replace("+00:00", "Z"),
-                    "base_cards": room.base_cards,
-                    "max_players": max_players,
-                },
-                "scoreboard": self.scoreboard.load_entries(),
-            }
+        if not snapshot.game_started:
+            return response
+
+        round_state = snapshot.round_state
+        order = snapshot.players_order
+
+        game_payload = {
+            "started": True,
+            "finished": snapshot.game_finished,
+            "current_round": snapshot.current_round + 1,
+            "total_rounds": len(snapshot.round_sequence),
+            "cards_per_player": round_state.cards_per_player if round_state else None,
+            "dealer_id": order[round_state.dealer_index] if round_state else None,
+            "starter_id": order[round_state.starter_index] if round_state else None,
+            "phase": round_state.status if round_state else "waiting",
+            "trump": TRUMP_INFO[snapshot.trump_index],
+            "bids": round_state.bids if round_state else {},
+            "tricks_won": round_state.tricks_won if round_state else {},
+            "current_trick": round_state.current_trick_payload if round_state else [],
+            "blind_bidding": bool(round_state.blind_bidding) if round_state else False,
+        }
 
-            if not room.game:
-                return response
-
-            game = room.game
-            round_state = game.round_state
-            trump_suit = SUIT_SEQUENCE[game.trump_index]
-
-            game_payload = {
-                "started": True,
-                "finished": game.finished,
-                "current_round": game.current_round + 1,
-                "total_rounds": len(game.round_sequence),
-                "cards_per_player": round_state.cards_per_player if round_state else None,
-                "dealer_id": game.players_order[round_state.dealer_index]
-                if round_state
-                else None,
-                "starter_id": game.players_order[round_state.starter_index]
-                if round_state
-                else None,
-                "phase": round_state.status if round_state else "waiting",
-                "trump": {
-                    "code": trump_suit,
-                    "name": SUIT_NAMES[trump_suit],
-                    "symbol": SUIT_SYMBOLS[trump_suit],
-                },
-                "bids": round_state.bids if round_state else {},
-                "tricks_won": round_state.tricks_won if round_state else {},
-                "current_trick": [
-                    {
-                        "player_id": play[0],
-                        "player_name": self._player_name(room, play[0]),
-                        "card": play[1],
-                        "display": card_to_display(play[1]),
-                    }
-                    for play in (round_state.current_trick if round_state else [])
-                ],
-                "blind_bidding": bool(round_state.blind_bidding) if round_state else False,
+        if round_state and snapshot.hand is not None:
+            if round_state.blind_bidding and round_state.status == "bidding":
+                game_payload["hand"] = [{"card": "??", "display": "??"}]
+            else:
+                game_payload["hand"] = [CARD_INFO[card] for card in snapshot.hand]
+
+        if round_state:
+            turn_player = order[round_state.current_turn_index]
+            game_payload["current_turn"] = {
+                "player_id": turn_player,
+                "player_name": names.get(turn_player, "Unknown"),
             }
+            if snapshot.allowed_bids is not None:
+                game_payload["allowed_bids"] = snapshot.allowed_bids
+            if snapshot.allowed_cards is not None:
+                game_payload["allowed_cards"] = [WIRE_STR[card] for card in snapshot.allowed_cards]
+
+        if (
+            round_state
+            and player_id
+            and snapshot.hand is not None
+            and not snapshot.hand
+            and round_state.status == "playing"
+        ):
+            game_payload["hand"] = []
+
+        game_payload["rounds"] = snapshot.rounds_summary
 
-            if round_state and player_id in round_state.hands:
-                hand_cards = (
-                    sorted(round_state.hands[player_id], key=card_sort_key)
-                    if not round_state.blind_bidding or round_state.status != "bidding"
-                    else ["??"]
-                )
-                game_payload["hand"] = [
-                    {"card": card, "display": card_to_display(card)}
-                    for card in hand_cards
-                    if card != "??"
-                ]
-                if hand_cards == ["??"]:
-                    game_payload["hand"] = [{"card": "??", "display": "??"}]
-
-            if round_state:
-                turn_player = game.players_order[round_state.current_turn_index]
-                game_payload["current_turn"] = {
-                    "player_id": turn_player,
-                    "player_name": self._player_name(room, turn_player),
-                }
-                if (
-                    player_id
-                    and round_state.status == "bidding"
-                    and player_id == turn_player
-                ):
-                    game_payload["allowed_bids"] = self._allowed_bids(
-                        game, round_state, player_id
-                    )
-                if (
-                    player_id
-                    and round_state.status == "playing"
-                    and player_id == turn_player
-                ):
-                    game_payload["allowed_cards"] = self._allowed_cards(
-                        round_state, player_id
-                    )
-
-            if (
-                round_state
-                and player_id
-                and player_id in round_state.hands
-                and not round_state.hands[player_id]
-                and round_state.status == "playing"
-            ):
-                game_payload["hand"] = []
+        response["game"] = game_payload
+        response["last_result"] = snapshot.last_result
+        return response
+
+    def _rounds_summary(self, room: Room) -> List[dict]:
+        if room.rounds_summary_version == room.version:
+            return room.rounds_summary
+        game = room.game
+        assert game is not None
+        round_state = game.round_state
 
         current_index: Optional[int] = None
         if round_state and not game.finished:
@@ -470,10 +924,10 @@ class GameManager:
                 entry.update(
                     {
                         "status": "complete",
-                        "bids": dict(log.get("bids", {})),
-                        "tricks_won": dict(log.get("tricks_won", {})),
-                        "points": dict(log.get("points", {})),
-                        "results": dict(log.get("results", {})),
+                        "bids": log.get("bids", {}),
+                        "tricks_won": log.get("tricks_won", {}),
+                        "points": log.get("points", {}),
+                        "results": log.get("results", {}),
                     }
                 )
             elif current_index is not None and idx == current_index and round_state:
@@ -488,28 +942,27 @@ class GameManager:
                 entry["is_current"] = True
             rounds_summary.append(entry)
 
-        game_payload["rounds"] = rounds_summary
-
-        response["game"] = game_payload
-        response["last_result"] = room.last_result
-        return response
-
-    def get_scoreboard(self) -> List[dict]:
-        return self.scoreboard.load_entries()
+        room.rounds_summary = rounds_summary
+        room.rounds_summary_version = room.version
+        return rounds_summary
 
     def _create_round_state(self, room: Room) -> RoundState:
         game = room.game
         assert game is not None
 
         cards_per_player = game.round_sequence[game.current_round]
-        deck = build_deck()
-        random.shuffle(deck)
+        drawn = random.sample(CARD_CODES, cards_per_player * len(game.players_order))
 
-        hands: Dict[str, List[str]] = {}
-        for player_id in game.players_order:
-            hand_cards = [deck.pop() for _ in range(cards_per_player)]
-            hand_cards.sort(key=card_sort_key)
+        hands: Dict[str, List[int]] = {}
+        suit_counts: Dict[str, List[int]] = {}
+        for seat, player_id in enumerate(game.players_order):
+            hand_cards = drawn[seat * cards_per_player : (seat + 1) * cards_per_player]
+            hand_cards.sort()
             hands[player_id] = hand_cards
+            counts = [0] * len(SUIT_SEQUENCE)
+            for card in hand_cards:
+                counts[SUIT_OF[card]] += 1
+            suit_counts[player_id] = counts
 
         starter_index = (game.dealer_index + 1) % len(game.players_order)
         bids = {player_id: None for player_id in game.players_order}
@@ -524,6 +977,7 @@ class GameManager:
             bids=bids,
             tricks_won=tricks_won,
             hands=hands,
+            suit_counts=suit_counts,
             blind_bidding=blind,
             current_turn_index=starter_index,
         )
@@ -539,89 +993,74 @@ class GameManager:
         dealer_id = game.players_order[round_state.dealer_index]
         allowed = list(range(0, round_state.cards_per_player + 1))
         if player_id == dealer_id:
-            current_total = sum(
-                bid for pid, bid in round_state.bids.items() if bid is not None and pid != player_id
-            )
-            forbidden = round_state.cards_per_player - current_total
+            forbidden = round_state.cards_per_player - round_state.bid_total
             if forbidden in allowed:
                 allowed.remove(forbidden)
         return allowed
 
-    def _allowed_cards(self, round_state: RoundState, player_id: str) -> List[str]:
+    def _allowed_cards(self, round_state: RoundState, player_id: str) -> List[int]:
         hand = round_state.hands[player_id]
         if not round_state.current_trick:
             return list(hand)
-        lead_suit = round_state.current_trick[0][1][-1]
-        matching = [card for card in hand if card.endswith(lead_suit)]
-        return matching if matching else list(hand)
+        lead_suit = SUIT_OF[round_state.current_trick[0][1]]
+        if not round_state.suit_counts[player_id][lead_suit]:
+            return list(hand)
+        return [card for card in hand if SUIT_OF[card] == lead_suit]
 
-    def _card_play_allowed(self, round_state: RoundState, hand: List[str], card: str) -> bool:
+    def _card_play_allowed(self, round_state: RoundState, player_id: str, card: int) -> bool:
         if not round_state.current_trick:
             return True
-        lead_suit = round_state.current_trick[0][1][-1]
-        if card.endswith(lead_suit):
-            return True
-        return not any(c.endswith(lead_suit) for c in hand)
+        lead_suit = SUIT_OF[round_state.current_trick[0][1]]
+        return SUIT_OF[card] == lead_suit or not round_state.suit_counts[player_id][lead_suit]
 
     def _close_trick(self, room: Room, game: GameState, round_state: RoundState) -> None:
-        trump_suit = SUIT_SEQUENCE[round_state.trump_index]
+        trump_suit = round_state.trump_index
         winning_play = round_state.current_trick[0]
-        lead_suit = winning_play[1][-1]
+        lead_suit = winning_suit = SUIT_OF[winning_play[1]]
+        winning_rank = RANK_OF[winning_play[1]]
         for play in round_state.current_trick[1:]:
-            _, card = play
-            if card.endswith(trump_suit):
-                if not winning_play[1].endswith(trump_suit) or self._card_higher(card, winning_play[1]):
-                    winning_play = play
-            elif winning_play[1].endswith(trump_suit):
+            card = play[1]
+            suit, rank = SUIT_OF[card], RANK_OF[card]
+            if suit == trump_suit:
+                if winning_suit != trump_suit or rank > winning_rank:
+                    winning_play, winning_suit, winning_rank = play, suit, rank
+            elif winning_suit == trump_suit:
                 continue
-            elif card.endswith(lead_suit) and self._card_higher(card, winning_play[1]):
-                winning_play = play
+            elif suit == lead_suit and rank > winning_rank:
+                winning_play, winning_rank = play, rank
 
         winner_id = winning_play[0]
         round_state.tricks_won[winner_id] += 1
         round_state.trick_history.append(
-            {
-                "winner_id": winner_id,
-                "cards": [
-                    {
-                        "player_id": pid,
-                        "player_name": self._player_name(room, pid),
-                        "card": card,
-                        "display": card_to_display(card),
-                    }
-                    for pid, card in round_state.current_trick
-                ],
-            }
+            {"winner_id": winner_id, "cards": round_state.current_trick_payload}
         )
         round_state.current_trick.clear()
+        round_state.current_trick_payload = []
 
         if all(len(hand) == 0 for hand in round_state.hands.values()):
-            logger.info(
-                "Room %s round %d: trick complete, winner=%s; bids=%s; tricks=%s",
-                room.code,
-                game.current_round + 1,
-                self._player_log(room, winner_id),
-                self._bids_debug(room, round_state),
-                {
-                    self._player_log(room, pid): won
-                    for pid, won in round_state.tricks_won.items()
-                },
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Room %s round %d: trick complete, winner=%s; bids=%s; tricks=%s",
+                    room.code,
+                    game.current_round + 1,
+                    self._player_log(room, winner_id),
+                    self._bids_debug(room, round_state),
+                    {
+                        self._player_log(room, pid): won
+                        for pid, won in round_state.tricks_won.items()
+                    },
+                )
             self._complete_round(room, game, round_state)
         else:
-            round_state.current_turn_index = game.players_order.index(winner_id)
-
-    def _card_higher(self, card_a: str, card_b: str) -> bool:
-        rank_a, rank_b = card_a[:-1], card_b[:-1]
-        return RANK_ORDER[rank_a] > RANK_ORDER[rank_b]
+            round_state.current_turn_index = game.seat_of[winner_id]
 
     def _complete_round(self, room: Room, game: GameState, round_state: RoundState) -> None:
         round_state.status = "complete"
         round_record = {
             "index": game.current_round,
             "cards": round_state.cards_per_player,
-            "bids": {pid: bid for pid, bid in round_state.bids.items()},
-            "tricks_won": {pid: count for pid, count in round_state.tricks_won.items()},
+            "bids": round_state.bids,
+            "tricks_won": round_state.tricks_won,
             "points": {},
             "results": {},
             "status": "complete",
@@ -654,15 +1093,16 @@ class GameManager:
             self.scoreboard.append_entry(result)
             game.round_state = None
         else:
-            logger.info(
-                "Room %s round completed; scores=%s; advancing to round %d",
-                room.code,
-                {
-                    self._player_log(room, player.player_id): player.total_score
-                    for player in room.players
-                },
-                game.current_round + 1,
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Room %s round completed; scores=%s; advancing to round %d",
+                    room.code,
+                    {
+                        self._player_log(room, player.player_id): player.total_score
+                        for player in room.players
+                    },
+                    game.current_round + 1,
+                )
             game.round_state = self._create_round_state(room)
 
     def _tally_results(self, room: Room) -> dict:
@@ -700,10 +1140,8 @@ class GameManager:
             raise ValueError("It is not your turn")
 
     def _player_name(self, room: Room, player_id: str) -> str:
-        for player in room.players:
-            if player.player_id == player_id:
-                return player.name
-        return "Unknown"
+        player = room.players_by_id.get(player_id)
+        return player.name if player else "Unknown"
 
     def _require_game_in_progress(self, room: Room) -> GameState:
         if not room.game:
@@ -722,10 +1160,9 @@ class GameManager:
         return room
 
     def _player_log(self, room: Room, player_id: str) -> str:
-        for player in room.players:
-            if player.player_id == player_id:
-                return f"{player.name}({player_id[:6]})"
-        return f"unknown({player_id[:6]})"
+        player = room.players_by_id.get(player_id)
+        name = player.name if player else "unknown"
+        return f"{name}({player_id[:6]})"
 
     def _bids_debug(self, room: Room, round_state: RoundState) -> Dict[str, Optional[int]]:
         summary = {}
@@ -744,86 +1181,97 @@ class GameManager:
 
     def _generate_room_code(self) -> str:
         while True:
-            code = "".join(random.choices(string.ascii_uppercase, k=4))
+            code = "".join(secrets.choice(string.ascii_uppercase) for _ in range(4))
             if code not in self.rooms:
                 return code
 
     @staticmethod
     def _generate_player_id() -> str:
-        return "".join(random.choices(string.ascii_lowercase + string.digits, k=16))
+        return secrets.token_hex(8)
 
 
 class JudgmentRequestHandler(BaseHTTPRequestHandler):
     manager = GameManager(ScoreboardStorage(SCOREBOARD_FILE))
+    protocol_version = RESPONSE_PROTOCOL
+    timeout = KEEP_ALIVE_TIMEOUT
+    disable_nagle_algorithm = True
 
     def do_OPTIONS(self) -> None:
-        self.send_response(HTTPStatus.NO_CONTENT)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
-        self.end_headers()
+        self._write_response(HTTPStatus.NO_CONTENT, OPTIONS_HEADERS)
 
     def do_GET(self) -> None:
-        parsed = urlparse(self.path)
-        if parsed.path == "/":
+        path, _, query = self.path.partition("?")
+        if path == "/":
             self._serve_static("index.html")
             return
-        if parsed.path.startswith("/static/"):
-            rel = parsed.path[len("/static/") :]
+        if path.startswith("/static/"):
+            rel = path[len("/static/") :]
             self._serve_static(rel)
             return
-        if parsed.path == "/api/state":
-            params = parse_qs(parsed.query or "")
-            room = params.get("room", [None])[0]
-            player_id = params.get("player_id", [None])[0]
+        if path == "/api/state":
+            params = parse_query(query)
+            room = params.get("room")
+            player_id = params.get("player_id")
+            since = params.get("since")
             if not room:
-                self._send_json({"error": "room parameter required"}, HTTPStatus.BAD_REQUEST)
+                self._send_error_json("room parameter required")
                 return
             try:
-                data = self.manager.get_state(room, player_id)
-                self._send_json(data)
+                result = self.manager.get_state_if_changed(room, player_id, since)
             except ValueError as exc:
-                self._send_json({"error": str(exc)}, HTTPStatus.BAD_REQUEST)
+                self._send_error_json(str(exc))
+                return
+            if result is None:
+                self._send_json_bytes(UNCHANGED_BODY)
+                return
+            self._send_encoded(result)
             return
-        if parsed.path == "/api/scoreboard":
-            data = self.manager.get_scoreboard()
-            self._send_json({"entries": data})
+        if path == "/api/scoreboard":
+            self._send_encoded(self.manager.scoreboard.entries_response())
             return
 
         self.send_error(HTTPStatus.NOT_FOUND, "Resource not found")
 
     def do_POST(self) -> None:
-        parsed = urlparse(self.path)
-        length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(length) if length else b""
+        path = self.path.partition("?")[0]
         try:
-            payload = json.loads(body.decode("utf-8")) if body else {}
-        except json.JSONDecodeError:
-            self._send_json({"error": "Invalid JSON"}, HTTPStatus.BAD_REQUEST)
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_REQUEST_BODY:
+            self.close_connection = True
+            if length < 0:
+                self._send_error_json("Invalid Content-Length")
+            else:
+                self._send_error_json("Request body too large", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
             return
 
-        handlers = {
-            "/api/create_room": self._handle_create_room,
-            "/api/join_room": self._handle_join_room,
-            "/api/start_game": self._handle_start_game,
-            "/api/submit_bid": self._handle_submit_bid,
-            "/api/play_card": self._handle_play_card,
-        }
+        if not length:
+            payload = {}
+        else:
+            try:
+                payload = decode_json(self.rfile.read(length))
+            except ValueError:  # JSONDecodeError, or UnicodeDecodeError for non-UTF-8 bodies
+                self._send_error_json("Invalid JSON")
+                return
+            if not isinstance(payload, dict):
+                self._send_error_json("Request body must be a JSON object")
+                return
 
-        handler = handlers.get(parsed.path)
+        handler = self.POST_ROUTES.get(path)
         if not handler:
-            self.send_error(HTTPStatus.NOT_FOUND, "Endpoint not found")
+            self._send_error_json("Endpoint not found", HTTPStatus.NOT_FOUND)
             return
 
         try:
-            response = handler(payload)
+            response = handler(self, payload)
             self._send_json(response)
         except ValueError as exc:
-            logger.warning("Request %s failed: %s", parsed.path, exc)
-            self._send_json({"error": str(exc)}, HTTPStatus.BAD_REQUEST)
+            logger.warning("Request %s failed: %s", path, exc)
+            self._send_error_json(str(exc))
 
     def _handle_create_room(self, payload: dict) -> dict:
-        host_name = payload.get("host_name", "")
+        (host_name,) = text_fields(payload, "host_name")
         base_value = payload.get("base_cards", DEFAULT_BASE_HAND)
         try:
             base_cards = int(base_value)
@@ -832,72 +1280,144 @@ class JudgmentRequestHandler(BaseHTTPRequestHandler):
         return self.manager.create_room(host_name, base_cards)
 
     def _handle_join_room(self, payload: dict) -> dict:
-        room_code = payload.get("room_code", "")
-        player_name = payload.get("player_name", "")
+        room_code, player_name = text_fields(payload, "room_code", "player_name")
         return self.manager.join_room(room_code, player_name)
 
     def _handle_start_game(self, payload: dict) -> dict:
-        room_code = payload.get("room_code", "")
-        player_id = payload.get("player_id", "")
+        room_code, player_id = text_fields(payload, "room_code", "player_id")
         return self.manager.start_game(room_code, player_id)
 
     def _handle_submit_bid(self, payload: dict) -> dict:
-        room_code = payload.get("room_code", "")
-        player_id = payload.get("player_id", "")
+        room_code, player_id = text_fields(payload, "room_code", "player_id")
         bid_value = payload.get("bid")
         if not isinstance(bid_value, int):
             raise ValueError("Bid must be an integer")
         return self.manager.submit_bid(room_code, player_id, bid_value)
 
     def _handle_play_card(self, payload: dict) -> dict:
-        room_code = payload.get("room_code", "")
-        player_id = payload.get("player_id", "")
-        card = payload.get("card", "")
+        room_code, player_id, card = text_fields(payload, "room_code", "player_id", "card")
         return self.manager.play_card(room_code, player_id, card)
 
+    POST_ROUTES = {
+        "/api/create_room": _handle_create_room,
+        "/api/join_room": _handle_join_room,
+        "/api/start_game": _handle_start_game,
+        "/api/submit_bid": _handle_submit_bid,
+        "/api/play_card": _handle_play_card,
+    }
+
     def _serve_static(self, relative_path: str) -> None:
-        path = (STATIC_DIR / relative_path).resolve()
-        if not str(path).startswith(str(STATIC_DIR.resolve())):
-            self.send_error(HTTPStatus.FORBIDDEN, "Invalid path")
-            return
-        if not path.exists() or not path.is_file():
+        asset = STATIC_CACHE.get(relative_path)
+        if asset is None:
             self.send_error(HTTPStatus.NOT_FOUND, "File not found")
             return
-        content = path.read_bytes()
-        self.send_response(HTTPStatus.OK)
-        self._set_common_headers()
-        if path.suffix == ".html":
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-        elif path.suffix == ".css":
-            self.send_header("Content-Type", "text/css; charset=utf-8")
-        elif path.suffix == ".js":
-            self.send_header("Content-Type", "application/javascript; charset=utf-8")
+        if asset.gzipped is not None and accepts_gzip(self.headers.get("Accept-Encoding", "")):
+            etag, headers, content = asset.gzip_etag, asset.gzip_headers, asset.gzipped
         else:
-            self.send_header("Content-Type", "application/octet-stream")
-        self.send_header("Content-Length", str(len(content)))
-        self.end_headers()
-        self.wfile.write(content)
+            etag, headers, content = asset.etag, asset.headers, asset.content
+        if not self._send_not_modified(etag):
+            self._write_response(HTTPStatus.OK, headers, content)
+
+    def _send_encoded(self, response: Union[EncodedBody, StateBody]) -> None:
+        etag, data, headers = response.etag, response.data, JSON_CONTENT_TYPE
+        if len(data) > GZIP_MIN_BYTES:
+            headers += VARY_HEADER
+            if accepts_gzip(self.headers.get("Accept-Encoding", "")):
+                etag, data, headers = gzip_etag(etag), response.compressed(), headers + GZIP_HEADER
+        if not self._send_not_modified(etag):
+            self._write_response(HTTPStatus.OK, revalidate_headers(etag) + headers, data)
 
     def _send_json(self, payload: dict, status: HTTPStatus = HTTPStatus.OK) -> None:
-        response = json.dumps(payload).encode("utf-8")
-        self.send_response(status)
-        self._set_common_headers()
-        self.send_header("Content-Type", "application/json; charset=utf-8")
-        self.send_header("Content-Length", str(len(response)))
-        self.end_headers()
-        self.wfile.write(response)
-
-    def _set_common_headers(self) -> None:
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Cache-Control", "no-store")
+        self._send_json_bytes(encode_json(payload), status)
+
+    def _send_json_bytes(self, response: bytes, status: HTTPStatus = HTTPStatus.OK) -> None:
+        self._write_response(status, NO_STORE_HEADERS + JSON_CONTENT_TYPE, response)
+
+    def _send_error_json(self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST) -> None:
+        body = ERROR_BODIES.get(message)
+        if body is None:
+            body = encode_json({"error": message})
+        self._send_json_bytes(body, status)
+
+    def _write_response(
+        self, status: HTTPStatus, headers: bytes, body: Optional[bytes] = None
+    ) -> None:
+        if not self.close_connection and self.server.saturated():
+            self.close_connection = True
+        connection = CLOSE_HEADER if self.close_connection else KEEP_ALIVE_HEADER
+        head = STATUS_LINES[status] + http_date_header() + connection + headers
+        if body is None:
+            self.wfile.write(head + b"\r\n")
+            return
+        head += b"Content-Length: %d\r\n\r\n" % len(body)
+        if len(body) > SINGLE_WRITE_LIMIT:
+            self.wfile.write(head)
+            self.wfile.write(body)
+        else:
+            self.wfile.write(head + body)
+
+    def _send_not_modified(self, etag: str) -> bool:
+        header = self.headers.get("If-None-Match")
+        if not header:
+            return False
+        candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        if etag not in candidates and "*" not in candidates:
+            return False
+        self._write_response(HTTPStatus.NOT_MODIFIED, revalidate_headers(etag))
+        return True
 
     def log_message(self, fmt: str, *args) -> None:
         # Reduce console noise by only logging warnings/errors
         pass
 
 
-def run_server(host: str = "127.0.0.1", port: int = 8000) -> None:
-    server = ThreadingHTTPServer((host, port), JudgmentRequestHandler)
+class JudgmentHTTPServer(HTTPServer):
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, threads: int = DEFAULT_HTTP_THREADS) -> None:
+        super().__init__(server_address, handler_class)
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="http")
+        self.threads = threads
+        self.admission = threading.BoundedSemaphore(threads * 2)
+        self.admitted = 0
+        self.admitted_lock = threading.Lock()
+
+    def saturated(self) -> bool:
+        return self.admitted >= self.threads
+
+    def process_request(self, request, client_address) -> None:
+        self.admission.acquire()
+        with self.admitted_lock:
+            self.admitted += 1
+        try:
+            self.pool.submit(self._process_request_worker, request, client_address)
+        except BaseException:
+            self._release()
+            self.shutdown_request(request)
+            raise
+
+    def _process_request_worker(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._release()
+
+    def _release(self) -> None:
+        with self.admitted_lock:
+            self.admitted -= 1
+        self.admission.release()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def run_server(host: str = "127.0.0.1", port: int = 8000, threads: int = DEFAULT_HTTP_THREADS) -> None:
+    threading.stack_size(HANDLER_THREAD_STACK_SIZE)
+    server = JudgmentHTTPServer((host, port), JudgmentRequestHandler, threads=threads)
     print(f"Judgment server running at http://{host}:{port}")
     try:
         server.serve_forever()
@@ -909,4 +1429,5 @@ def run_server(host: str = "127.0.0.1", port: int = 8000) -> None:
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", "8080"))
-    run_server(host="0.0.0.0", port=port)
+    threads = int(os.environ.get("JUDGMENT_HTTP_THREADS", DEFAULT_HTTP_THREADS))
+    run_server(host="0.0.0.0", port=port, threads=threads)